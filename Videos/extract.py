@@ -1,10 +1,99 @@
+import av
 import cv2
 import os
+import queue
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Frames buffered between pipeline stages (bounds memory use)
+PREFETCH_FRAMES = 32
+
+# Threads doing rotate + JPEG encode (OpenCV releases the GIL while encoding)
+ENCODE_WORKERS = os.cpu_count() or 4
+
+# JPEG quality for saved frames (0-100)
+JPEG_QUALITY = 92
+
+# ------------------------------------------------------------------
+# FIX: Correct orientation of the source footage (degrees, counter-clockwise)
+# 180 = what cv2.flip(frame, -1) used to do (flip both axes)
+# ------------------------------------------------------------------
+ORIENTATION_FIX = 180
+
+# Counter-clockwise rotation (mod 360) -> cv2.rotate code
+ROTATE_CODES = {
+    90: cv2.ROTATE_90_COUNTERCLOCKWISE,
+    180: cv2.ROTATE_180,
+    270: cv2.ROTATE_90_CLOCKWISE,
+}
+
+
+def _read_frames(container, frame_queue):
+    """
+    Reader stage: decodes frames and hands them to the encoder stage.
+    Always finishes with a None sentinel, even if decoding fails midway.
+    """
+    try:
+        stream = container.streams.video[0]
+        for frame_index, frame in enumerate(container.decode(stream)):
+            frame_queue.put((frame_index, frame.to_ndarray(format="bgr24"), frame.rotation))
+    except av.FFmpegError as e:
+        print(f"Error: Decoding stopped early: {e}")
+    finally:
+        frame_queue.put(None)
+
+
+def _encode_frame(frame, rotation):
+    # The container's display rotation (applied by cv2.VideoCapture before)
+    # and the orientation fix are combined, so each frame is rotated at most
+    # once instead of being rotated and then flipped
+    total_rotation = (rotation + ORIENTATION_FIX) % 360
+    if total_rotation in ROTATE_CODES:
+        frame = cv2.rotate(frame, ROTATE_CODES[total_rotation])
+
+    success, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+    if not success:
+        raise RuntimeError("JPEG encoding failed")
+    return buffer
+
+
+def _write_frames(write_queue, output_folder, counter):
+    """
+    Writer stage: waits on encoded frames in order and writes them to disk.
+    Stops at the None sentinel.
+    """
+    while True:
+        item = write_queue.get()
+        if item is None:
+            break
+
+        frame_index, future = item
+        filename = f"frame_{str(frame_index).zfill(5)}.jpg"
+        save_path = os.path.join(output_folder, filename)
+
+        try:
+            buffer = future.result()
+            with open(save_path, "wb") as f:
+                f.write(buffer.tobytes())
+        except Exception as e:
+            # Keep draining the queue so the other stages can finish
+            print(f"Error: Could not save '{save_path}': {e}")
+            continue
+
+        counter[0] += 1
+
+        if counter[0] % 100 == 0:
+            print(f"  ... extracted {counter[0]} frames")
+
 
 def extract_frames(video_path, output_folder):
     """
     Extracts all frames from a video file and saves them to an output folder.
+
+    Runs as a pipeline: a reader thread decodes (PyAV), a thread pool rotates and
+    encodes, and a writer thread writes the files, so decoding never sits
+    idle waiting on JPEG compression or disk I/O.
     """
     # --- 1. Basic Setup and Checks ---
     if not os.path.exists(video_path):
@@ -16,42 +105,51 @@ def extract_frames(video_path, output_folder):
         print(f"Created output folder: '{output_folder}'")
 
     # --- 2. Open the Video File ---
-    video_capture = cv2.VideoCapture(video_path)
-    if not video_capture.isOpened():
-        print(f"Error: Could not open video file '{video_path}'")
+    try:
+        container = av.open(video_path)
+    except av.FFmpegError as e:
+        print(f"Error: Could not open video file '{video_path}': {e}")
+        return
+
+    if not container.streams.video:
+        print(f"Error: No video stream in '{video_path}'")
+        container.close()
         return
-        
+
+    # Let FFmpeg decode on its own frame/slice threads
+    container.streams.video[0].thread_type = "AUTO"
+
     print("Starting frame extraction...")
-    
-    # --- 3. Loop Through Video and Extract Frames ---
-    frame_count = 0
-    while True:
-        success, frame = video_capture.read()
 
-        if not success:
-            break
-        
-        # ------------------------------------------------------------------
-        # FIX: Flip the frame to correct orientation
-        # 0  = Flip vertically
-        # 1  = Flip horizontally
-        # -1 = Flip both (Rotates image 180 degrees)
-        # ------------------------------------------------------------------
-        frame = cv2.flip(frame, -1)
-
-        filename = f"frame_{str(frame_count).zfill(5)}.png"
-        save_path = os.path.join(output_folder, filename)
-        
-        cv2.imwrite(save_path, frame)
-        
-        frame_count += 1
+    # --- 3. Run the Decode -> Flip/Encode -> Write Pipeline ---
+    frame_queue = queue.Queue(maxsize=PREFETCH_FRAMES)
+    write_queue = queue.Queue(maxsize=PREFETCH_FRAMES)
+    counter = [0]
+
+    reader = threading.Thread(target=_read_frames, args=(container, frame_queue), daemon=True)
+    writer = threading.Thread(target=_write_frames, args=(write_queue, output_folder, counter), daemon=True)
+    reader.start()
+    writer.start()
 
-        if frame_count % 100 == 0:
-            print(f"  ... extracted {frame_count} frames")
+    # Main thread hands decoded frames to the encoder pool, in order
+    with ThreadPoolExecutor(max_workers=ENCODE_WORKERS) as executor:
+        while True:
+            item = frame_queue.get()
+            if item is None:
+                break
+
+            frame_index, frame, rotation = item
+            write_queue.put((frame_index, executor.submit(_encode_frame, frame, rotation)))
+
+        write_queue.put(None)
+        writer.join()
+
+    reader.join()
+    frame_count = counter[0]
 
     # --- 4. Clean Up ---
-    video_capture.release()
-    
+    container.close()
+
     print("-" * 30)
     print(f"Successfully extracted {frame_count} frames.")
     print(f"Frames are saved in: '{output_folder}'")
@@ -62,4 +160,4 @@ def extract_frames(video_path, output_folder):
 if __name__ == "__main__":
     vid_path = input("Enter the full path to your video file: ")
     out_folder = input("Enter the name of the folder to save frames: ")
-    extract_frames(vid_path, out_folder)
\ No newline at end of file
+    extract_frames(vid_path, out_folder)
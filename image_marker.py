@@ -1,7 +1,7 @@
 """
 File: image_marker.py
 Description: A Tkinter-based GUI to display an image with scrollbars and output 
-             clicked coordinates to stdout.
+             clicked coordinates to stdout. Can also be used in-process via ask_click().
 """
 
 # ==========================================
@@ -28,15 +28,15 @@ MSG_NO_CLICK = "NO_CLICK_DATA_AVAILABLE"
 import sys
 import tkinter as tk
 from tkinter import filedialog
-from PIL import Image, ImageTk
 
 
 # ==========================================
 #                APP LOGIC
 # ==========================================
 class ImageMarkerApp:
-    def __init__(self, root, image_path):
+    def __init__(self, root, image_path, on_click=None):
         self.root = root
+        self.on_click = on_click
         self.root.title("Image Click Marker (Scrollable)")
         self.image_path = image_path
 
@@ -77,6 +77,11 @@ class ImageMarkerApp:
         self.root.protocol("WM_DELETE_WINDOW", self.on_manual_close)
 
     def load_image(self):
+        # Imported here so the script (and the file dialog) starts without
+        # waiting for Pillow; Image.open itself only loads the plugin that
+        # matches the file extension
+        from PIL import Image, ImageTk
+
         try:
             self.pil_original_image = Image.open(self.image_path)
             img_width, img_height = self.pil_original_image.size
@@ -127,6 +132,9 @@ class ImageMarkerApp:
 
         self.output_coordinates()
 
+        if self.on_click:
+            self.on_click(self.last_click_coords)
+
     def output_coordinates(self):
         if self.last_click_coords:
             print(f"X:{self.last_click_coords[0]},Y:{self.last_click_coords[1]}")
@@ -140,6 +148,25 @@ class ImageMarkerApp:
         sys.stdout.flush()
         self.root.destroy()
 
+def ask_click(image_path):
+    """
+    Shows the image and waits for one click, in the calling process.
+    Returns (x, y), or (None, None) if the window was closed without a click.
+    """
+    root = tk.Tk()
+    # Leave the event loop on the first click; the window is torn down below
+    app_instance = ImageMarkerApp(root, image_path, on_click=lambda coords: root.quit())
+    root.mainloop()
+
+    try:
+        root.destroy()
+    except tk.TclError:
+        pass  # Already destroyed by on_manual_close
+
+    if app_instance.last_click_coords:
+        return app_instance.last_click_coords
+    return None, None
+
 # ==========================================
 #                   MAIN
 # ==========================================
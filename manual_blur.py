@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import filedialog
 import math
 import os
+import numpy as np
 from PIL import Image, ImageTk
 
 # ==========================================
@@ -50,6 +51,12 @@ class ImageEditorApp:
             root.destroy()
             return
 
+        # Pixel edits go straight into these arrays; pil_image is only
+        # rebuilt from main_arr when a full redraw needs it
+        self.main_arr = np.array(self.pil_image)
+        self.ref_arr = np.asarray(self.ref_image)
+        self._image_stale = False
+
         # --- State Variables ---
         self.zoom_scale = 1.0
         self.pan_x = 0
@@ -60,6 +67,12 @@ class ImageEditorApp:
         self.drag_start_y = 0
         self.is_dragging = False
 
+        # Set while a redraw is queued (coalesces bursts of motion events)
+        self._redraw_pending = False
+
+        # Downscaled copies of pil_image for zoomed-out views, keyed by level
+        self._pyramid = {}
+
         # --- UI Setup ---
         self.canvas = tk.Canvas(root, bg="#222222", cursor="arrow")
         self.canvas.pack(fill="both", expand=True)
@@ -86,17 +99,18 @@ class ImageEditorApp:
         print("Left Click (Hold+Drag) to pan.")
 
     def redraw_image(self):
-        """Resizes and draws the image based on zoom/pan settings."""
+        """Draws the part of the zoomed image that is visible on the canvas."""
         new_width = int(self.pil_image.width * self.zoom_scale)
         new_height = int(self.pil_image.height * self.zoom_scale)
 
         if new_width <= 0 or new_height <= 0: return
 
-        # Use NEAREST neighbor so pixels are crisp when zoomed in
-        resized_pil = self.pil_image.resize((new_width, new_height), Image.Resampling.NEAREST)
-        
-        self.tk_image = ImageTk.PhotoImage(resized_pil)
-        
+        # Pick up pixel edits made in main_arr since the last full redraw
+        if self._image_stale:
+            self.pil_image = Image.fromarray(self.main_arr)
+            self._pyramid.clear()
+            self._image_stale = False
+
         self.canvas.delete("all")
         
         # Calculate center position relative to window center + pan offset
@@ -109,11 +123,89 @@ class ImageEditorApp:
         center_x = (win_w // 2) + self.pan_x
         center_y = (win_h // 2) + self.pan_y
         
-        self.canvas.create_image(center_x, center_y, anchor="center", image=self.tk_image)
-        
         self.current_center_x = center_x
         self.current_center_y = center_y
 
+        # Top-left corner of the (virtual) zoomed image on the canvas
+        left = center_x - (new_width // 2)
+        top = center_y - (new_height // 2)
+        self.view_left = left
+        self.view_top = top
+
+        # Part of the canvas the image actually covers
+        vis_x0 = max(left, 0)
+        vis_y0 = max(top, 0)
+        vis_x1 = min(left + new_width, win_w)
+        vis_y1 = min(top + new_height, win_h)
+        if vis_x0 >= vis_x1 or vis_y0 >= vis_y1:
+            self.tk_image = None
+            return
+
+        # When zoomed out, sample from the smallest cached copy that is
+        # still at least as large as the zoomed image
+        level = max(0, int(-math.log2(self.zoom_scale)))
+        source = self.get_pyramid_level(level)
+        scale_x = self.zoom_scale * self.pil_image.width / source.width
+        scale_y = self.zoom_scale * self.pil_image.height / source.height
+
+        # Same rectangle in source pixels; resize() crops to it, so the cost
+        # depends on the canvas size instead of the zoom level
+        src_box = ((vis_x0 - left) / scale_x, (vis_y0 - top) / scale_y,
+                   (vis_x1 - left) / scale_x, (vis_y1 - top) / scale_y)
+
+        # Use NEAREST neighbor so pixels are crisp when zoomed in
+        visible_pil = source.resize((vis_x1 - vis_x0, vis_y1 - vis_y0),
+                                    Image.Resampling.NEAREST, box=src_box)
+        
+        self.tk_image = ImageTk.PhotoImage(visible_pil)
+        self.view_x0 = vis_x0
+        self.view_y0 = vis_y0
+        
+        self.canvas.create_image(vis_x0, vis_y0, anchor="nw", image=self.tk_image)
+
+    def blit_pixel(self, ix, iy, color):
+        """Paints one image pixel into the displayed PhotoImage, without a redraw."""
+        if self.tk_image is None:
+            return
+
+        # Display pixels that NEAREST sampling maps to source pixel (ix, iy),
+        # relative to the top-left corner of the visible PhotoImage (an edge
+        # landing exactly on a pixel boundary may be off by one until the
+        # next full redraw)
+        x0 = math.ceil(self.view_left + ix * self.zoom_scale - 0.5) - self.view_x0
+        y0 = math.ceil(self.view_top + iy * self.zoom_scale - 0.5) - self.view_y0
+        x1 = max(x0 + 1, math.ceil(self.view_left + (ix + 1) * self.zoom_scale - 0.5) - self.view_x0)
+        y1 = max(y0 + 1, math.ceil(self.view_top + (iy + 1) * self.zoom_scale - 0.5) - self.view_y0)
+
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1, y1 = min(x1, self.tk_image.width()), min(y1, self.tk_image.height())
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        # Tk fills the region with a single color in place
+        hex_color = "#%02x%02x%02x" % tuple(color)
+        self.canvas.tk.call(str(self.tk_image), "put", hex_color, "-to", x0, y0, x1, y1)
+
+    def get_pyramid_level(self, level):
+        """Returns pil_image shrunk by 2**level, building it on first use."""
+        if level == 0:
+            return self.pil_image
+
+        if level not in self._pyramid:
+            size = (max(1, self.pil_image.width >> level), max(1, self.pil_image.height >> level))
+            self._pyramid[level] = self.pil_image.resize(size, Image.Resampling.NEAREST)
+        return self._pyramid[level]
+
+    def schedule_redraw(self):
+        """Queues a single redraw for when Tk is idle; repeat calls are merged."""
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.root.after_idle(self._do_redraw)
+
+    def _do_redraw(self):
+        self._redraw_pending = False
+        self.redraw_image()
+
     def canvas_to_image_coords(self, cx, cy):
         """Converts screen coordinates to actual image pixel coordinates."""
         img_w = int(self.pil_image.width * self.zoom_scale)
@@ -152,7 +244,7 @@ class ImageEditorApp:
             self.drag_start_x = event.x
             self.drag_start_y = event.y
             
-            self.redraw_image()
+            self.schedule_redraw()
 
     def on_mouse_up(self, event):
         self.canvas.config(cursor="arrow") 
@@ -168,7 +260,7 @@ class ImageEditorApp:
             self.zoom_scale /= scale_factor
         else:
             self.zoom_scale *= scale_factor
-        self.redraw_image()
+        self.schedule_redraw()
 
     # --- Pixel Logic ---
 
@@ -181,20 +273,23 @@ class ImageEditorApp:
             # --- THE CHANGE: GET PIXEL FROM REFERENCE IMAGE ---
             try:
                 # 1. Get the color from the reference image at the exact same coordinate
-                source_color = self.ref_image.getpixel((ix, iy))
+                source_color = tuple(self.ref_arr[iy, ix].tolist())
                 
-                # 2. Update the main image
-                self.pil_image.putpixel((ix, iy), source_color)
+                # 2. Update the main image (pil_image and zoom levels are now stale)
+                self.main_arr[iy, ix] = source_color
+                self._image_stale = True
                 
                 print(f"Copied pixel at ({ix}, {iy}): {source_color} from reference.")
-                self.redraw_image()
+
+                # 3. Patch just that pixel on screen instead of redrawing everything
+                self.blit_pixel(ix, iy, source_color)
             except Exception as e:
                 print(f"Error swapping pixel: {e}")
 
     def on_close(self):
         print("Closing window...")
         try:
-            self.pil_image.save(OUTPUT_FILENAME)
+            Image.fromarray(self.main_arr).save(OUTPUT_FILENAME)
             print(f"SUCCESS: Image saved as '{OUTPUT_FILENAME}'")
         except Exception as e:
             print(f"ERROR: Could not save image: {e}")
@@ -15,8 +15,6 @@ IMAGE_2_PATH = 'frame_1.png'
 # IMAGE_1_PATH = 'frame_1.png'
 # IMAGE_2_PATH = 'frame_2.png'
 
-MARKER_SCRIPT_FILENAME = "image_marker.py"
-
 # --- Matching Logic Constants ---
 # The size of the square used for pixel comparison (width/height)
 MATCH_BLOCK_SIZE = 60 
@@ -30,8 +28,9 @@ SEARCH_RANGE_Y = 30
 # Maximum allowed difference per RGB channel sum to consider a pixel a "match"
 PIXEL_DIFF_THRESHOLD = 25
 
-# Stop searching a specific block if mismatch count exceeds this
-MAX_MISMATCH_TOLERANCE = 1000 
+# Downscale factor for the frames used in block matching (1 = full resolution).
+# JPEG inputs are decoded straight to the smaller size via Pillow's draft mode.
+MATCH_SCALE = 1
 
 # --- Visualization & Processing ---
 # Gaussian blur radius for preprocessing/visuals
@@ -45,15 +44,17 @@ RESULT_SQUARE_WIDTH = 2
 #                  IMPORTS
 # ==========================================
 import os
-import subprocess
-import sys
 import time
 import math
-from functools import wraps
+from functools import lru_cache, wraps
+import cv2
+import numpy as np
+from numba import njit, prange
 from PIL import Image, ImageDraw, ImageFilter
 from rich.console import Console
 import tkinter as tk
 from PIL import ImageTk
+from image_marker import ask_click
 
 # ==========================================
 #           UTILITY & DECORATORS
@@ -77,53 +78,52 @@ def printHex(pixel):
 #           MATH & BLUR ALGORITHMS
 # ==========================================
 
+@lru_cache(maxsize=16)
 def gaussian_kernel(radius, sigma=None):
-    """Generate a 1D Gaussian kernel."""
+    """Generate a 1D Gaussian kernel (float32, cached per radius/sigma)."""
     if sigma is None:
         sigma = radius / 2.0  # rule of thumb
     kernel = [math.exp(-(x**2) / (2 * sigma**2)) for x in range(-radius, radius+1)]
     s = sum(kernel)
-    return [v/s for v in kernel]  # normalize
+    kernel = np.array([v/s for v in kernel], dtype=np.float32)  # normalize
+    # The same array is handed to every caller, so keep it read-only
+    kernel.setflags(write=False)
+    return kernel
 
-def gaussian_blur(image, radius=2):
-    """Apply a Gaussian blur to a 2D RGB image using separable convolution."""
-    height = len(image)
-    width = len(image[0])
-    kernel = gaussian_kernel(radius)
-    k_len = len(kernel)
+@njit(parallel=True, fastmath=True, cache=True)
+def _separable_gaussian(image, kernel, radius):
+    """Numba kernel behind gaussian_blur; rows run in parallel in both passes."""
+    height, width, channels = image.shape
+    k_len = kernel.shape[0]
 
     # Horizontal pass
-    temp = [[(0, 0, 0) for _ in range(width)] for _ in range(height)]
-    for y in range(height):
+    temp = np.empty((height, width, channels), dtype=np.float32)
+    for y in prange(height):
         for x in range(width):
-            r_total = g_total = b_total = 0.0
-            for k in range(k_len):
-                dx = k - radius
-                nx = min(max(x + dx, 0), width - 1)
-                r, g, b = image[y][nx]
-                weight = kernel[k]
-                r_total += r * weight
-                g_total += g * weight
-                b_total += b * weight
-            temp[y][x] = (r_total, g_total, b_total)
+            for c in range(channels):
+                total = np.float32(0.0)
+                for k in range(k_len):
+                    nx = min(max(x + k - radius, 0), width - 1)
+                    total += image[y, nx, c] * kernel[k]
+                temp[y, x, c] = total
 
     # Vertical pass
-    blurred = [[(0, 0, 0) for _ in range(width)] for _ in range(height)]
-    for y in range(height):
+    blurred = np.empty((height, width, channels), dtype=np.uint8)
+    for y in prange(height):
         for x in range(width):
-            r_total = g_total = b_total = 0.0
-            for k in range(k_len):
-                dy = k - radius
-                ny = min(max(y + dy, 0), height - 1)
-                r, g, b = temp[ny][x]
-                weight = kernel[k]
-                r_total += r * weight
-                g_total += g * weight
-                b_total += b * weight
-            blurred[y][x] = (int(r_total), int(g_total), int(b_total))
+            for c in range(channels):
+                total = np.float32(0.0)
+                for k in range(k_len):
+                    ny = min(max(y + k - radius, 0), height - 1)
+                    total += temp[ny, x, c] * kernel[k]
+                blurred[y, x, c] = np.uint8(total)
 
     return blurred
 
+def gaussian_blur(image, radius=2):
+    """Apply a Gaussian blur to an HxWx3 RGB array using separable convolution."""
+    return _separable_gaussian(image, gaussian_kernel(radius), radius)
+
 
 # ==========================================
 #           ADDITIONAL BLUR ALGORITHMS
@@ -134,9 +134,11 @@ def box_blur(image, radius=2):
     Applies a Box Blur (Average Blur) to the image.
     Each pixel is the average of its neighbors.
     """
-    height = len(image)
-    width = len(image[0])
-    blurred = [[(0, 0, 0) for _ in range(width)] for _ in range(height)]
+    height, width = image.shape[:2]
+    image = image.tolist()
+    # Flat RGB output buffer, written in scan order (no per-pixel tuples)
+    blurred = bytearray(height * width * 3)
+    out = 0
     
     for y in range(height):
         for x in range(width):
@@ -158,11 +160,12 @@ def box_blur(image, radius=2):
                         count += 1
             
             if count > 0:
-                blurred[y][x] = (int(r_sum//count), int(g_sum//count), int(b_sum//count))
+                blurred[out:out + 3] = bytes((r_sum // count, g_sum // count, b_sum // count))
             else:
-                blurred[y][x] = image[y][x]
+                blurred[out:out + 3] = bytes(image[y][x])
+            out += 3
                 
-    return blurred
+    return np.frombuffer(blurred, dtype=np.uint8).reshape(height, width, 3)
 
 
 def median_blur(image, radius=2):
@@ -170,9 +173,11 @@ def median_blur(image, radius=2):
     Applies a Median Blur to the image.
     Good for removing salt-and-pepper noise while preserving edges.
     """
-    height = len(image)
-    width = len(image[0])
-    blurred = [[(0, 0, 0) for _ in range(width)] for _ in range(height)]
+    height, width = image.shape[:2]
+    image = image.tolist()
+    # Flat RGB output buffer, written in scan order (no per-pixel tuples)
+    blurred = bytearray(height * width * 3)
+    out = 0
 
     for y in range(height):
         for x in range(width):
@@ -195,9 +200,10 @@ def median_blur(image, radius=2):
             neighbors_b.sort()
             
             mid = len(neighbors_r) // 2
-            blurred[y][x] = (neighbors_r[mid], neighbors_g[mid], neighbors_b[mid])
+            blurred[out:out + 3] = bytes((neighbors_r[mid], neighbors_g[mid], neighbors_b[mid]))
+            out += 3
 
-    return blurred
+    return np.frombuffer(blurred, dtype=np.uint8).reshape(height, width, 3)
 
 def multi_pass_box_blur(image, radius=2, passes=3):
     """
@@ -215,60 +221,57 @@ def multi_pass_box_blur(image, radius=2, passes=3):
     return current_image
 
 
+def opencv_gaussian_blur(image, radius=2):
+    """
+    Same kernel as gaussian_blur (size 2*radius+1, sigma = radius/2,
+    edge pixels repeated), but run by OpenCV's separable SIMD filter in C.
+    """
+    ksize = 2 * radius + 1
+    return cv2.GaussianBlur(image, (ksize, ksize), sigmaX=radius / 2.0,
+                            borderType=cv2.BORDER_REPLICATE)
+
+
 def pillow_native_smooth_blur(pixel_data, radius=5):
     """
-    Advanced: Converts the list-of-lists pixel data back to a Pillow Image,
-    applies the highly optimized C-based Gaussian Blur (allowing for 
-    large radii), and converts it back.
+    Advanced: Converts the pixel array to a Pillow Image, applies the
+    highly optimized C-based Gaussian Blur (allowing for large radii),
+    and converts it back.
     
     Gives the 'smoothest' gradient possible (Creamy/Bokeh look).
     """
-    height = len(pixel_data)
-    width = len(pixel_data[0])
-    
-    # 1. Convert List-of-Lists back to PIL Image
-    temp_img = Image.new('RGB', (width, height))
-    pixels = temp_img.load()
-    for y in range(height):
-        for x in range(width):
-            pixels[x, y] = pixel_data[y][x]
+    # 1. Wrap the array as a PIL Image
+    temp_img = Image.fromarray(pixel_data)
             
     # 2. Apply Heavy Smoothing using PIL's optimized filter
     # increasing radius here makes it much smoother (e.g., 10 or 20)
     blurred_img = temp_img.filter(ImageFilter.GaussianBlur(radius))
     
-    # 3. Convert back to List-of-Lists
-    blurred_pixels = blurred_img.load()
-    new_pixel_data = [[(0,0,0) for _ in range(width)] for _ in range(height)]
-    for y in range(height):
-        for x in range(width):
-            new_pixel_data[y][x] = blurred_pixels[x, y]
-            
-    return new_pixel_data
+    # 3. Convert back to an array
+    return np.asarray(blurred_img)
 
 # ==========================================
 #           IMAGE PROCESSING LOGIC
 # ==========================================
 
 @timing_decorator
-def extract_pixels_pillow(image_path):
+def open_lazy(image_path, scale=1):
+    """
+    Opens an image without decoding its pixels (that happens on first crop).
+    With scale > 1 the image is reduced to 1/scale of its size.
+    """
     try:
         img = Image.open(image_path)
         Console().print(f"[green]Image loaded successfully: {image_path}[/green]")
         print(f"Image format: {img.format}, Size: {img.size}, Mode: {img.mode}")
 
-        width, height = img.size
-        pixel_data = img.load()
-        pixel_values = [[(0, 0, 0) for _ in range(width)] for _ in range(height)]
-        
-        for y in range(0, height):
-            for x in range(0, width):
-                try:
-                    pixel_values[y][x] = pixel_data[x, y]
-                except Exception:
-                    pass
-
-        return pixel_values  
+        if scale > 1:
+            target_size = (img.size[0] // scale, img.size[1] // scale)
+            # JPEG: libjpeg scales in the DCT domain while decoding (no-op for other formats)
+            img.draft('RGB', target_size)
+            if img.size != target_size:
+                img = img.resize(target_size, Image.Resampling.BOX)
+
+        return img
     except FileNotFoundError:
         print(f"Error: Image file not found at {image_path}")
         return None
@@ -276,57 +279,190 @@ def extract_pixels_pillow(image_path):
         print(f"An error occurred: {e}")
         return None
 
-def match(frame_one, frame_two, second_start_x, second_start_y, first_start_x, first_start_y):
-    width = len(frame_one[0])
-    height = len(frame_one)
+def crop_to_array(img, box=None):
+    """Returns the (left, top, right, bottom) box of img, or all of it, as an HxWx3 uint8 array."""
+    region = img if box is None else img.crop(box)
+    # Single HxWx3 uint8 buffer, indexed as [y, x]
+    return np.asarray(region.convert('RGB'))
+
+def match(frame_one, frame_two, second_start_x, second_start_y, first_start_x, first_start_y,
+          block_size=MATCH_BLOCK_SIZE):
+    height, width = frame_one.shape[:2]
 
     # Check boundaries including the block size
-    if (first_start_x + MATCH_BLOCK_SIZE >= width or first_start_y + MATCH_BLOCK_SIZE >= height 
-        or second_start_x + MATCH_BLOCK_SIZE >= width or second_start_y + MATCH_BLOCK_SIZE >= height
+    if (first_start_x + block_size >= width or first_start_y + block_size >= height 
+        or second_start_x + block_size >= width or second_start_y + block_size >= height
         or first_start_x < 0 or first_start_y < 0
         or second_start_x < 0 or second_start_y < 0):
         return [10000000, 0]
     
-    pixel_cnt = 0
-    match_cnt = 0
-    
-    for y in range(0, MATCH_BLOCK_SIZE + 1):
-        for x in range(0, MATCH_BLOCK_SIZE + 1):
-            pixel_cnt += 1
-            
-            # Calculate Manhattan distance for RGB
-            dif = (abs(frame_one[y + first_start_y][x + first_start_x][0] - frame_two[y + second_start_y][x + second_start_x][0]) 
-                 + abs(frame_one[y + first_start_y][x + first_start_x][1] - frame_two[y + second_start_y][x + second_start_x][1])
-                 + abs(frame_one[y + first_start_y][x + first_start_x][2] - frame_two[y + second_start_y][x + second_start_x][2]))
+    # int16 is wide enough for a 3-channel abs-diff sum (max 765);
+    # no copy is made when the caller already passes int16 frames
+    block_one = frame_one[first_start_y:first_start_y + block_size + 1,
+                          first_start_x:first_start_x + block_size + 1].astype(np.int16, copy=False)
+    block_two = frame_two[second_start_y:second_start_y + block_size + 1,
+                          second_start_x:second_start_x + block_size + 1].astype(np.int16, copy=False)
 
-            if abs(dif) < PIXEL_DIFF_THRESHOLD:
-                match_cnt += 1
-            
-            if pixel_cnt - match_cnt > MAX_MISMATCH_TOLERANCE:
-                return [10000000, 0]
+    # Manhattan distance for RGB over the whole block in one go
+    dif = np.abs(block_one - block_two).sum(axis=2)
+
+    pixel_cnt = dif.size
+    match_cnt = int((dif < PIXEL_DIFF_THRESHOLD).sum())
 
     return [pixel_cnt, match_cnt]
 
-@timing_decorator
-def find_position_in_first_image(frame_one, frame_two, start_x, start_y):
-    """
-    Searches for the block defined by start_x/y in frame_two within frame_one.
-    """
+def exhaustive_block_search(frame_one, frame_two, start_x, start_y,
+                            block_size=MATCH_BLOCK_SIZE, range_x=SEARCH_RANGE_X, range_y=SEARCH_RANGE_Y):
+    """Scores every candidate offset in the search range with match()."""
     min_val = 1_000_000_000
     yy, xx = -1, -1
 
-    # Search range defined in config
-    for y in range(start_y - SEARCH_RANGE_Y, start_y + SEARCH_RANGE_Y + 1):
-        for x in range(start_x - SEARCH_RANGE_X, start_x + SEARCH_RANGE_X + 1):
-            [i, j] = match(frame_one, frame_two, x, y, start_x, start_y)
+    # Widen once up front instead of once per candidate inside match()
+    frame_one = frame_one.astype(np.int16)
+    frame_two = frame_two.astype(np.int16)
+
+    # Search range defined in config (scaled by the caller if needed)
+    for y in range(start_y - range_y, start_y + range_y + 1):
+        for x in range(start_x - range_x, start_x + range_x + 1):
+            [i, j] = match(frame_one, frame_two, x, y, start_x, start_y, block_size)
             if min_val > i - j:
                 min_val = i - j
                 # Center offset adjustment
-                yy, xx = y + (MATCH_BLOCK_SIZE // 2), x + (MATCH_BLOCK_SIZE // 2)
+                yy, xx = y + (block_size // 2), x + (block_size // 2)
     
     print("[Min val, xx, yy] :", min_val, xx, yy)
     return xx, yy
 
+@njit(parallel=True, cache=True)
+def _mismatch_scores(frame_one, frame_two, start_x, start_y, block, range_x, range_y, threshold):
+    """Numba kernel: match()'s pixel_cnt - match_cnt for every candidate offset."""
+    height, width = frame_one.shape[:2]
+    rows, cols = 2 * range_y + 1, 2 * range_x + 1
+
+    # Out-of-bounds candidates keep match()'s sentinel score
+    scores = np.full((rows, cols), 10000000, dtype=np.int64)
+    if start_x < 0 or start_y < 0 or start_x + block > width or start_y + block > height:
+        return scores
+
+    for row in prange(rows):
+        y = start_y - range_y + row
+        if y < 0 or y + block > height:
+            continue
+        for col in range(cols):
+            x = start_x - range_x + col
+            if x < 0 or x + block > width:
+                continue
+
+            match_cnt = 0
+            for by in range(block):
+                for bx in range(block):
+                    dif = 0
+                    for c in range(3):
+                        dif += abs(np.int32(frame_one[start_y + by, start_x + bx, c])
+                                   - np.int32(frame_two[y + by, x + bx, c]))
+                    if dif < threshold:
+                        match_cnt += 1
+            scores[row, col] = block * block - match_cnt
+
+    return scores
+
+def numba_block_search(frame_one, frame_two, start_x, start_y,
+                       block_size=MATCH_BLOCK_SIZE, range_x=SEARCH_RANGE_X, range_y=SEARCH_RANGE_Y):
+    """Same scores and result as exhaustive_block_search, computed by a compiled kernel."""
+    scores = _mismatch_scores(frame_one, frame_two, start_x, start_y,
+                              block_size + 1, range_x, range_y, PIXEL_DIFF_THRESHOLD)
+
+    # argmin keeps the first minimum in scan order, like the strict '>' loop
+    row, col = np.unravel_index(np.argmin(scores), scores.shape)
+    min_val = int(scores[row, col])
+    yy = start_y - range_y + int(row) + (block_size // 2)
+    xx = start_x - range_x + int(col) + (block_size // 2)
+
+    print("[Min val, xx, yy] :", min_val, xx, yy)
+    return xx, yy
+
+def template_match_search(frame_one, frame_two, start_x, start_y,
+                          block_size=MATCH_BLOCK_SIZE, range_x=SEARCH_RANGE_X, range_y=SEARCH_RANGE_Y):
+    """
+    Slides the block over the search window in one cv2.matchTemplate call
+    and takes the position with the lowest normalized squared difference.
+    """
+    block = block_size + 1
+    height, width = frame_one.shape[:2]
+    if start_x < 0 or start_y < 0 or start_x + block > width or start_y + block > height:
+        print("Reference block lies outside the first image.")
+        return -1, -1
+
+    template = frame_one[start_y:start_y + block, start_x:start_x + block]
+
+    # Window holding every candidate top-left corner, clipped to the second image
+    x0 = max(start_x - range_x, 0)
+    y0 = max(start_y - range_y, 0)
+    x1 = min(start_x + range_x + block, frame_two.shape[1])
+    y1 = min(start_y + range_y + block, frame_two.shape[0])
+    region = frame_two[y0:y1, x0:x1]
+    if region.shape[0] < block or region.shape[1] < block:
+        print("Search window lies outside the second image.")
+        return -1, -1
+
+    result = cv2.matchTemplate(region, template, cv2.TM_SQDIFF_NORMED)
+    min_val, _, min_loc, _ = cv2.minMaxLoc(result)
+
+    # Back to absolute coordinates, plus the center offset
+    xx = x0 + min_loc[0] + (block_size // 2)
+    yy = y0 + min_loc[1] + (block_size // 2)
+
+    print("[Min val, xx, yy] :", min_val, xx, yy)
+    return xx, yy
+
+def search_box(start_x, start_y, size, scale=1):
+    """
+    Box of an image (given at 1/scale resolution) holding the reference block at
+    start_x/y plus every candidate position; nothing outside it is ever compared.
+    """
+    width, height = size
+    block = MATCH_BLOCK_SIZE // scale + 1
+    range_x, range_y = SEARCH_RANGE_X // scale, SEARCH_RANGE_Y // scale
+    start_x, start_y = start_x // scale, start_y // scale
+
+    left = min(max(start_x - range_x, 0), width)
+    top = min(max(start_y - range_y, 0), height)
+    right = max(min(start_x + range_x + block, width), left)
+    bottom = max(min(start_y + range_y + block, height), top)
+    return left, top, right, bottom
+
+@timing_decorator
+def find_position_in_first_image(frame_one, frame_two, start_x, start_y, scale=1):
+    """
+    Searches for the block defined by start_x/y in frame_two within frame_one.
+
+    The frames may have been loaded at 1/scale resolution (see MATCH_SCALE);
+    start_x/y and the returned center are always full-resolution coordinates.
+    """
+    start_x, start_y = start_x // scale, start_y // scale
+    block_size = MATCH_BLOCK_SIZE // scale
+    range_x, range_y = SEARCH_RANGE_X // scale, SEARCH_RANGE_Y // scale
+
+    # ---------------------------------------------------------
+    # --- SELECT SEARCH ALGORITHM HERE ---
+    # Uncomment the specific algorithm you want to test.
+    # ---------------------------------------------------------
+
+    # Option 1: OpenCV template matching (SIMD + multithreaded C)
+    xx, yy = template_match_search(frame_one, frame_two, start_x, start_y, block_size, range_x, range_y)
+
+    # Option 2: Exhaustive search scored by thresholded mismatch count
+    # xx, yy = exhaustive_block_search(frame_one, frame_two, start_x, start_y, block_size, range_x, range_y)
+
+    # Option 3: Same scoring as Option 2, Numba-compiled and parallel over rows
+    # xx, yy = numba_block_search(frame_one, frame_two, start_x, start_y, block_size, range_x, range_y)
+
+    # ---------------------------------------------------------
+
+    if xx < 0 or yy < 0:
+        return xx, yy
+    return xx * scale, yy * scale
+
 # ==========================================
 #        MODIFIED DRAW FUNCTION
 # ==========================================
@@ -334,56 +470,52 @@ def find_position_in_first_image(frame_one, frame_two, start_x, start_y):
 def draw_unmatched_pixels(input_image_path, frame_one, first_center_x, first_center_y, frame_two, second_center_x, second_center_y):
     console = Console()
     try:
-        img = Image.open(input_image_path)
-        console.print(f"[cyan]Loading image for diff: {input_image_path}[/cyan]")
-        
-        width, height = img.size
-        new_img = Image.new(img.mode, img.size)
-        pixels_out = new_img.load()
+        # frame_one already holds the decoded pixels of input_image_path
+        console.print(f"[cyan]Building diff for: {input_image_path}[/cyan]")
         
-        out_img = Image.new(img.mode, img.size)
-        out_pixels_out = out_img.load()
-
         # ---------------------------------------------------------
         # --- SELECT BLUR ALGORITHM HERE ---
         # Uncomment the specific algorithm you want to test.
         # ---------------------------------------------------------
         
-        # Option 1: Standard Gaussian (Manual implementation)
-        processed_frame = gaussian_blur(frame_one, BLUR_RADIUS)
+        # Option 1: Standard Gaussian (OpenCV, same kernel as Option 2)
+        processed_frame = opencv_gaussian_blur(frame_one, BLUR_RADIUS)
 
-        # Option 2: Multi-Pass Box Blur (Very smooth, organic approximation)
+        # Option 2: Standard Gaussian (Manual implementation, Numba-compiled)
+        # processed_frame = gaussian_blur(frame_one, BLUR_RADIUS)
+
+        # Option 3: Multi-Pass Box Blur (Very smooth, organic approximation)
         # processed_frame = multi_pass_box_blur(frame_one, radius=3, passes=3)
 
-        # Option 3: Pillow Native (BEST for "Creamy" smoothness)
+        # Option 4: Pillow Native (BEST for "Creamy" smoothness)
         # It handles larger radius (e.g., 10) efficiently.
         # processed_frame = pillow_native_smooth_blur(frame_one, radius=8)
         
         # ---------------------------------------------------------
 
         console.print(f"[cyan]Applying modification...[/cyan]")
-        for y in range(height):
-            for x in range(width):
-                # Map coordinates relative to the matched centers
-                sx = (x + second_center_x - first_center_x)
-                sy = (y + second_center_y - first_center_y)
-
-                pixels_out[x, y] = frame_one[y][x]
-
-                if 0 <= sx < width and 0 <= sy < height:
-                    dif = (abs(frame_one[y][x][0] - frame_two[sy][sx][0])
-                         + abs(frame_one[y][x][1] - frame_two[sy][sx][1])
-                         + abs(frame_one[y][x][2] - frame_two[sy][sx][2]))
-                    
-                    if dif > 0:
-                        # --- MODIFIED: USE BLURRED PIXEL INSTEAD OF BLACK ---
-                        # We grab the pre-calculated blurred pixel at this location
-                        out_pixels_out[x, y] = processed_frame[y][x]
-                    else:                    
-                        out_pixels_out[x, y] = pixels_out[x, y]
-                else:
-                    # Out of bounds comparison
-                    out_pixels_out[x, y] = pixels_out[x, y]
+
+        # Map coordinates relative to the matched centers
+        dx = second_center_x - first_center_x
+        dy = second_center_y - first_center_y
+
+        # Part of frame_one that lands inside frame_two after the shift;
+        # everything outside it is an out of bounds comparison and stays as-is
+        height, width = frame_one.shape[:2]
+        height_two, width_two = frame_two.shape[:2]
+        x0, x1 = max(0, -dx), min(width, width_two - dx)
+        y0, y1 = max(0, -dy), min(height, height_two - dy)
+
+        out = frame_one.copy()
+        if x0 < x1 and y0 < y1:
+            # Any channel differing means the RGB abs-diff sum is > 0
+            mask = np.any(frame_one[y0:y1, x0:x1] != frame_two[y0 + dy:y1 + dy, x0 + dx:x1 + dx], axis=2)
+
+            # --- MODIFIED: USE BLURRED PIXEL INSTEAD OF BLACK ---
+            # We grab the pre-calculated blurred pixel at these locations
+            out[y0:y1, x0:x1][mask] = processed_frame[y0:y1, x0:x1][mask]
+
+        out_img = Image.fromarray(out)
 
         # ---------------------------------------------------------
         # REPLACED out_img.show() WITH TKINTER WINDOW
@@ -423,9 +555,6 @@ def draw_unmatched_pixels(input_image_path, frame_one, first_center_x, first_cen
         
         return True
         
-    except FileNotFoundError:
-        console.print(f"[red]Error: Input image file not found at {input_image_path}[/red]")
-        return False
     except Exception as e:
         console.print(f"[red]An error occurred: {e}[/red]")
         return False
@@ -461,7 +590,7 @@ def draw_square_and_open(image_path, center_x, center_y):
         return False
 
 # ==========================================
-#           SUBPROCESS / GUI COMMS
+#                GUI COMMS
 # ==========================================
 
 def get_coordinates_from_image(image_path_to_process):
@@ -469,48 +598,20 @@ def get_coordinates_from_image(image_path_to_process):
         print(f"Error: Image file not found at '{image_path_to_process}'")
         return None, None
 
+    # The marker window runs in this process; no interpreter start-up or
+    # stdout parsing per click
+    print(f"Opening marker window on '{image_path_to_process}'. Click the image.")
     try:
-        process = subprocess.Popen(
-            [sys.executable, MARKER_SCRIPT_FILENAME, image_path_to_process],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1
-        )
-
-        print(f"Launched marker script on '{image_path_to_process}'. Click the image.")
-        
-        while True:
-            output_line = process.stdout.readline()
-            if not output_line:
-                break
-
-            line_content = output_line.strip()
-            print(f"[Marker Output]: {line_content}")
-
-            if "WINDOW_CLOSED_MANUALLY" in line_content:
-                print("Window closed.")
-                break
-            elif "NO_IMAGE_SELECTED" in line_content:
-                break
-            elif line_content.startswith("X:") and ",Y:" in line_content:
-                try:
-                    parts = line_content.split(',')
-                    x_part = parts[0].split(':')[1]
-                    y_part = parts[1].split(':')[1]
-                    x_coord, y_coord = int(x_part), int(y_part)
-                    print(f"RECEIVED: X={x_coord}, Y={y_coord}")
-                    # process.kill() # Close the GUI once we have coordinates
-                    return x_coord, y_coord
-                except Exception as e:
-                    print(f"Error parsing coordinates: {e}")
-
-        process.wait()
+        x_coord, y_coord = ask_click(image_path_to_process)
+    except tk.TclError as e:
+        print(f"GUI error: {e}")
         return None, None
 
-    except Exception as e:
-        print(f"Subprocess error: {e}")
-        return None, None
+    if x_coord is None:
+        print("Window closed.")
+    else:
+        print(f"RECEIVED: X={x_coord}, Y={y_coord}")
+    return x_coord, y_coord
 
 # ==========================================
 #                   MAIN
@@ -523,19 +624,39 @@ if __name__ == "__main__":
     if x is not None and y is not None:
         print(f"Processing around: {x}, {y}")
         
-        # 2. Load pixel data
-        frame_one = extract_pixels_pillow(IMAGE_1_PATH)
-        frame_two = extract_pixels_pillow(IMAGE_2_PATH)
-
-        if frame_one and frame_two:
+        # 2. Open both images; pixels are decoded on first use, once per file
+        image_one = open_lazy(IMAGE_1_PATH)
+        image_two = open_lazy(IMAGE_2_PATH)
+
+        # Block matching can run on reduced-resolution copies
+        if MATCH_SCALE > 1:
+            match_image_one = open_lazy(IMAGE_1_PATH, MATCH_SCALE)
+            match_image_two = open_lazy(IMAGE_2_PATH, MATCH_SCALE)
+        else:
+            match_image_one, match_image_two = image_one, image_two
+
+        if all(img is not None for img in (image_one, image_two, match_image_one, match_image_two)):
             # 3. Find matching position in the second image
             # Adjustment: The algorithm subtracts half block size to search top-left corner
             half_block = MATCH_BLOCK_SIZE // 2
-            mx, my = find_position_in_first_image(frame_one, frame_two, x - half_block, y - half_block)
+            start_x, start_y = x - half_block, y - half_block
+
+            # Only the search window around the click is needed for matching
+            box = search_box(start_x, start_y, match_image_one.size, MATCH_SCALE)
+            match_one = crop_to_array(match_image_one, box)
+            match_two = crop_to_array(match_image_two, box)
+            offset_x, offset_y = box[0] * MATCH_SCALE, box[1] * MATCH_SCALE
+
+            mx, my = find_position_in_first_image(match_one, match_two,
+                                                  start_x - offset_x, start_y - offset_y, MATCH_SCALE)
+            if mx >= 0 and my >= 0:
+                mx, my = mx + offset_x, my + offset_y
             
             print(f"Match found at: {mx}, {my}")
 
-            # 4. Visualize results
+            # 4. Visualize results (the full frames reuse the decoded images)
+            frame_one = crop_to_array(image_one)
+            frame_two = crop_to_array(image_two)
             draw_square_and_open(IMAGE_2_PATH, mx, my)
             draw_unmatched_pixels(IMAGE_1_PATH, frame_one, x, y, frame_two, mx, my)
     else:
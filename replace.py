@@ -24,9 +24,18 @@ FRAME_ONE_Y = 431
 FRAME_TWO_X = 504
 FRAME_TWO_Y = 431
 
+# Wrap the texture around (x % width, y % height) so it covers the whole image
+TILE_TEXTURE = False
+
 # --- Comparison Logic ---
 SIMILARITY_THRESHOLD = 1 
 
+# --- Performance ---
+# Scanlines per parallel fill task (each task keeps its own active edge list)
+FILL_CHUNK_ROWS = 64
+# Rows per band of the texture pass; keeps each band's temporaries cache-sized
+COMPARE_BAND_ROWS = 128
+
 # --- Drawing/UI Settings ---
 DRAW_COLOR = (255, 255, 255)
 ERASE_RADIUS = 3
@@ -40,67 +49,307 @@ MOVE_STEP = 1    # Pixels to move per key press (increase for speed)
 #                  IMPORTS
 # ==========================================
 import tkinter as tk
-from PIL import Image, ImageTk, ImageDraw
+from PIL import Image, ImageTk, ImageDraw, ImageChops
+import numpy as np
+from numba import njit, prange
 import sys
+import threading
+
+# OpenCV is optional: its absdiff is a single SIMD pass over the bytes
+try:
+    import cv2
+except ImportError:
+    cv2 = None
 
 # ==========================================
 #           IMAGE PROCESSING LOGIC
 # ==========================================
 
-def manual_fill_polygon(image, vertices, tex_pixels, tex_width, tex_height):
-    """Fills the INSIDE of a polygon by mapping pixels from a texture image."""
-    pixels = image.load()
-    if not vertices: return
-    
+def open_rgb(path):
+    """Opens an image as RGB, converting (and copying) only if it isn't RGB already."""
+    img = Image.open(path)
+    # Decode now, so a broken file fails here and not on first use
+    img.load()
+    return img if img.mode == 'RGB' else img.convert('RGB')
+
+def texture_overlap(shape, tex_shape, dx, dy):
+    """
+    Slices (main, texture) of the part of the main image that has a texture
+    pixel under it once the texture is shifted by dx/dy, or None if nothing does.
+    """
+    height, width = shape[:2]
+    tex_height, tex_width = tex_shape[:2]
+
+    x0, x1 = max(0, -dx), min(width, tex_width - dx)
+    y0, y1 = max(0, -dy), min(height, tex_height - dy)
+    if x0 >= x1 or y0 >= y1:
+        return None
+
+    return ((slice(y0, y1), slice(x0, x1)),
+            (slice(y0 + dy, y1 + dy), slice(x0 + dx, x1 + dx)))
+
+def tiled_texture(tex, shape, dx, dy):
+    """The texture shifted by dx/dy and wrapped so it lines up with every pixel of shape."""
+    rows = (np.arange(shape[0]) + dy) % tex.shape[0]
+    cols = (np.arange(shape[1]) + dx) % tex.shape[1]
+    # Two gathers, one per axis, instead of an index pair per pixel
+    return tex.take(rows, axis=0).take(cols, axis=1)
+
+def apply_texture(main, tex, dx, dy, inside):
+    """
+    One pass over the texture overlap: pixels inside the polygon take the texture
+    pixel, pixels outside that match it are nudged one red level away from it.
+    Works in place on HxWx3 arrays; returns the (left, top, right, bottom) box
+    of the pixels it changed, or None.
+    """
+    overlap = texture_overlap(main.shape, tex.shape, dx, dy)
+    if overlap is None:
+        return None
+    main_slices, tex_slices = overlap
+
+    main_region = main[main_slices]
+    tex_region = tex[tex_slices]
+    fill = inside[main_slices]
+
+    # Full-width row bands: short enough that the diff/mask temporaries stay
+    # in cache, wide enough that per-call NumPy overhead stays small
+    rows_hit = np.zeros(main_region.shape[0], dtype=bool)
+    cols_hit = np.zeros(main_region.shape[1], dtype=bool)
+    for top in range(0, main_region.shape[0], COMPARE_BAND_ROWS):
+        band = slice(top, top + COMPARE_BAND_ROWS)
+        write = _apply_texture_band(main_region[band], tex_region[band], fill[band])
+        rows_hit[band] = write.any(axis=1)
+        cols_hit |= write.any(axis=0)
+
+    rows = np.flatnonzero(rows_hit)
+    cols = np.flatnonzero(cols_hit)
+    if rows.size == 0:
+        return None
+    x0, y0 = main_slices[1].start, main_slices[0].start
+    return (x0 + int(cols[0]), y0 + int(rows[0]), x0 + int(cols[-1]) + 1, y0 + int(rows[-1]) + 1)
+
+def _apply_texture_band(main_band, tex_band, fill):
+    """apply_texture for one band of aligned rows; returns the mask it wrote."""
+    similar = ~fill & _matches_texture(main_band, tex_band)
+
+    write = fill | similar
+
+    # One masked store per channel plane (no gathered RGB copy). Red takes
+    # r ^ 1 on the similar pixels: flips the lowest bit, so it is always
+    # exactly one level away and never wraps; fills keep r as is
+    np.copyto(main_band[..., 0], tex_band[..., 0] ^ similar.view(np.uint8), where=write)
+    np.copyto(main_band[..., 1], tex_band[..., 1], where=write)
+    np.copyto(main_band[..., 2], tex_band[..., 2], where=write)
+    return write
+
+def _matches_texture(main_band, tex_band):
+    """Pixels whose summed per-channel difference is below SIMILARITY_THRESHOLD."""
+    # A threshold of 1 only accepts exact matches: byte compares, no sum needed
+    if SIMILARITY_THRESHOLD == 1:
+        if cv2 is not None:
+            diff = cv2.absdiff(main_band, tex_band)
+            return (diff[..., 0] | diff[..., 1] | diff[..., 2]) == 0
+        return ((main_band[..., 0] == tex_band[..., 0])
+                & (main_band[..., 1] == tex_band[..., 1])
+                & (main_band[..., 2] == tex_band[..., 2]))
+
+    # Per-channel |main - tex| (stays uint8), then the channel sum
+    if cv2 is not None:
+        diff = cv2.absdiff(main_band, tex_band)
+    else:
+        diff = np.asarray(ImageChops.difference(Image.fromarray(main_band), Image.fromarray(tex_band)))
+    diff_sum = diff[..., 0].astype(np.uint16) + diff[..., 1] + diff[..., 2]
+    return diff_sum < SIMILARITY_THRESHOLD
+
+def build_edge_table(vertices):
+    """
+    Non-horizontal polygon edges as arrays sorted by their top row:
+    top row, bottom row (exclusive), x at the top row, and the edge's dx/dy.
+    """
+    n = len(vertices)
+    edges = []
+    for i in range(n):
+        (x1, y1), (x2, y2) = vertices[i], vertices[(i + 1) % n]
+        if y1 == y2:
+            continue
+        if y1 > y2:
+            x1, y1, x2, y2 = x2, y2, x1, y1
+        edges.append((y1, y2, x1, x2 - x1, y2 - y1))
+    edges.sort()
+
+    table = np.array(edges, dtype=np.int64).reshape(-1, 5)
+    return table[:, 0].copy(), table[:, 1].copy(), table[:, 2].copy(), table[:, 3].copy(), table[:, 4].copy()
+
+@njit(parallel=True, cache=True)
+def _scanline_mask(inside, edge_top, edge_bottom, edge_x, edge_dx, edge_dy,
+                   min_y, max_y, chunk_rows):
+    """
+    Numba kernel behind polygon_mask. Blocks of chunk_rows scanlines run
+    in parallel; within a block an active edge list is carried from row to row.
+    """
+    width = inside.shape[1]
+    n_edges = edge_top.shape[0]
+    n_chunks = (max_y - min_y + chunk_rows) // chunk_rows
+
+    for chunk in prange(n_chunks):
+        first_y = min_y + chunk * chunk_rows
+        last_y = min(first_y + chunk_rows - 1, max_y)
+
+        # Active edges: index plus (y - top) * dx, so x = x_top + numer / dy is
+        # computed exactly, not accumulated from a rounded slope
+        active = np.empty(n_edges, dtype=np.int64)
+        numer = np.empty(n_edges, dtype=np.int64)
+        n_active = 0
+        next_edge = 0
+        while next_edge < n_edges and edge_top[next_edge] <= first_y:
+            if first_y < edge_bottom[next_edge]:
+                active[n_active] = next_edge
+                numer[n_active] = (first_y - edge_top[next_edge]) * edge_dx[next_edge]
+                n_active += 1
+            next_edge += 1
+
+        intersections = np.empty(n_edges, dtype=np.float64)
+        for y in range(first_y, last_y + 1):
+            # Edges starting on this row join, edges that ended leave
+            while next_edge < n_edges and edge_top[next_edge] == y:
+                active[n_active] = next_edge
+                numer[n_active] = 0
+                n_active += 1
+                next_edge += 1
+
+            kept = 0
+            for a in range(n_active):
+                if edge_bottom[active[a]] > y:
+                    active[kept] = active[a]
+                    numer[kept] = numer[a]
+                    kept += 1
+            n_active = kept
+
+            # Crossings of this scanline, insertion-sorted (only a handful per row)
+            for a in range(n_active):
+                e = active[a]
+                value = edge_x[e] + numer[a] / edge_dy[e]
+                numer[a] += edge_dx[e]
+                j = a - 1
+                while j >= 0 and intersections[j] > value:
+                    intersections[j + 1] = intersections[j]
+                    j -= 1
+                intersections[j + 1] = value
+
+            # Pixels strictly between each pair of rounded crossings
+            for i in range(0, n_active - 1, 2):
+                x_start = max(0, round(intersections[i]))
+                x_end = min(width - 1, round(intersections[i + 1]))
+                if x_start + 1 < x_end:
+                    inside[y, x_start + 1:x_end] = True
+
+def polygon_mask(vertices, width, height):
+    """HxW bool mask of the pixels the scanline fill treats as inside the polygon."""
+    inside = np.zeros((height, width), dtype=np.bool_)
+    if not vertices:
+        return inside
+
     # Clamp bounds to image size
-    min_y = min(v[1] for v in vertices)
-    max_y = max(v[1] for v in vertices)
-    min_y = max(0, min_y)
-    max_y = min(image.height - 1, max_y)
-
-    for y in range(image.height):
-        for x in range(image.width):
-            # Calculate texture coordinate
-            tex_x = (x + FRAME_TWO_X - FRAME_ONE_X)
-            tex_y = (y + FRAME_TWO_Y - FRAME_ONE_Y)
-
-            if 0 <= tex_x < tex_width and 0 <= tex_y < tex_height:
-                r1, g1, b1 = pixels[x, y]
-                r2, g2, b2 = tex_pixels[tex_x, tex_y]
-                diff = abs(r1 - r2) + abs(g1 - g2) + abs(b1 - b2)
-
-                if diff < SIMILARITY_THRESHOLD:
-                    new_r = r2 - 1 if r2 == 255 else r2 + 1
-                    pixels[x, y] = (new_r, g2, b2)
-                    
-
-    # 1. Fill Inside Polygon
-    for y in range(min_y, max_y + 1):
-        intersections = []
-        for i in range(len(vertices)):
-            p1 = vertices[i]
-            p2 = vertices[(i + 1) % len(vertices)]
-            if (p1[1] <= y < p2[1]) or (p2[1] <= y < p1[1]):
-                if p1[1] != p2[1]:
-                    x = p1[0] + (y - p1[1]) * (p2[0] - p1[0]) / (p2[1] - p1[1])
-                    intersections.append(x)
-        intersections.sort()
-        
-        for i in range(0, len(intersections), 2):
-            if i + 1 < len(intersections):
-                x_start = round(intersections[i])
-                x_end = round(intersections[i+1])
-                x_start = max(0, x_start)
-                x_end = min(image.width - 1, x_end)
-
-                for x in range(x_start+1, x_end):
-                    try:
-                        tex_x = (x + FRAME_TWO_X - FRAME_ONE_X)
-                        tex_y = (y + FRAME_TWO_Y - FRAME_ONE_Y)
-                        if 0 <= tex_x < tex_width and 0 <= tex_y < tex_height:
-                           pixels[x, y] = tex_pixels[tex_x, tex_y]
-                    except Exception:
-                        pass
+    min_y = max(0, min(v[1] for v in vertices))
+    max_y = min(height - 1, max(v[1] for v in vertices))
+
+    _scanline_mask(inside, *build_edge_table(vertices), min_y, max_y, FILL_CHUNK_ROWS)
+    return inside
+
+def numpy_polygon_mask(vertices, width, height):
+    """Same pixels as polygon_mask, built with whole-array NumPy ops (no JIT)."""
+    inside = np.zeros((height, width), dtype=np.bool_)
+    if not vertices:
+        return inside
+
+    min_y = max(0, min(v[1] for v in vertices))
+    max_y = min(height - 1, max(v[1] for v in vertices))
+    top, bottom, x_top, edge_dx, edge_dy = build_edge_table(vertices)
+
+    # One (row, x) crossing per edge per scanline it spans, for all edges at once
+    first = np.maximum(top, min_y)
+    counts = np.maximum(np.minimum(bottom, max_y + 1) - first, 0)
+    total = int(counts.sum())
+    if total == 0:
+        return inside
+    edge = np.repeat(np.arange(top.shape[0]), counts)
+    ys = first[edge] + np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    xs = x_top[edge] + ((ys - top[edge]) * edge_dx[edge]) / edge_dy[edge]
+
+    # Sorted by row, then x: every row holds an even run of crossings, so
+    # consecutive pairs are the spans (same rounding as the kernel)
+    order = np.lexsort((xs, ys))
+    ys, xs = ys[order], xs[order]
+    rows = ys[0::2]
+    x_start = np.maximum(0, np.round(xs[0::2])).astype(np.int64) + 1
+    x_end = np.minimum(width - 1, np.round(xs[1::2])).astype(np.int64)
+    keep = x_start < x_end
+    rows, x_start, x_end = rows[keep], x_start[keep], x_end[keep]
+
+    # Spans never overlap, so +1/-1 marks and a running sum give the mask
+    marks = np.zeros((max_y - min_y + 1, width + 1), dtype=np.int8)
+    np.add.at(marks, (rows - min_y, x_start), 1)
+    np.add.at(marks, (rows - min_y, x_end), -1)
+    inside[min_y:max_y + 1] = np.cumsum(marks[:, :width], axis=1, dtype=np.int8) != 0
+    return inside
+
+def warm_up_kernels():
+    """Compiles (or loads from cache) the Numba kernels by running them on a tiny polygon."""
+    polygon_mask([(0, 0), (3, 0), (3, 3), (0, 3)], 4, 4)
+
+def pillow_polygon_mask(vertices, width, height):
+    """Same as polygon_mask, but rasterized by ImageDraw (boundary pixels count as inside)."""
+    # A mode '1' image comes out of np.asarray as a bool array directly
+    mask_img = Image.new('1', (width, height), 0)
+    if len(vertices) > 1:
+        ImageDraw.Draw(mask_img).polygon(vertices, fill=1)
+    return np.asarray(mask_img)
+
+def manual_fill_polygon(image, vertices, tex_img):
+    """
+    Fills the INSIDE of a polygon by mapping pixels from a texture image.
+    image and tex_img may be PIL images or HxWx3 uint8 arrays; an image
+    array is edited in place. Returns the box of the pixels that changed, or None.
+    """
+    if not vertices: return None
+
+    dx = FRAME_TWO_X - FRAME_ONE_X
+    dy = FRAME_TWO_Y - FRAME_ONE_Y
+
+    # Arrays are worked on directly; a PIL image gets a copy pasted back below
+    main = image if isinstance(image, np.ndarray) else np.array(image)
+    tex = np.asarray(tex_img)
+    height, width = main.shape[:2]
+
+    if TILE_TEXTURE:
+        # Already aligned and the size of the image, so the overlap is everything
+        tex = tiled_texture(tex, main.shape, dx, dy)
+        dx = dy = 0
+
+    # ---------------------------------------------------------
+    # --- SELECT POLYGON RASTERIZER HERE ---
+    # Uncomment the specific rasterizer you want to use.
+    # ---------------------------------------------------------
+
+    # Option 1: Scanline kernel (Numba, same edge pixels as the original fill)
+    inside = polygon_mask(vertices, width, height)
+
+    # Option 2: Pillow ImageDraw (C, no JIT warm-up; also fills the outline itself)
+    # inside = pillow_polygon_mask(vertices, width, height)
+
+    # Option 3: NumPy edge arrays (same pixels as Option 1, no JIT warm-up)
+    # inside = numpy_polygon_mask(vertices, width, height)
+
+    # ---------------------------------------------------------
+
+    # Fill the INSIDE and compare the OUTSIDE in the same pass
+    bbox = apply_texture(main, tex, dx, dy, inside)
+
+    # Back into the image in one paste, of just the changed box
+    if bbox is not None and main is not image:
+        x0, y0, x1, y1 = bbox
+        image.paste(Image.fromarray(main[y0:y1, x0:x1]), (x0, y0))
+    return bbox
 
 # ==========================================
 #              GUI APPLICATION
@@ -113,18 +362,23 @@ class TexturizerApp:
         
         # --- Load Images ---
         try:
-            self.img_orig = Image.open(main_img_path).convert('RGB')
-            self.out_img = self.img_orig.copy() 
+            self.img_orig = open_rgb(main_img_path)
+            # The output lives in this array; PIL images are only made from it
+            # for the canvas and for saving
+            self.orig_arr = np.asarray(self.img_orig)
+            self.out_arr = np.array(self.img_orig)
             
-            self.tex_img = Image.open(tex_img_path).convert('RGB')
-            self.tex_pixels = self.tex_img.load()
-            self.tex_width, self.tex_height = self.tex_img.size
+            self.tex_img = open_rgb(tex_img_path)
+            # Read-only pixel array of the texture, converted once for every fill
+            self.tex_arr = np.asarray(self.tex_img)
         except Exception as e:
             print(f"Error loading images: {e}")
             sys.exit(1)
 
         # --- State ---
-        self.drawn_points = []
+        # Points as an (N, 2) int32 array of x, y; pts_xy has spare capacity
+        self.pts_xy = np.empty((64, 2), dtype=np.int32)
+        self.n_pts = 0
         self.current_mode = "draw"
         
         # Cursor State
@@ -132,11 +386,20 @@ class TexturizerApp:
         self.cursor_y = self.img_orig.height // 2
         self.cursor_items = [] # Stores canvas IDs for the crosshair
 
+        # Canvas image: one PhotoImage, re-uploaded only where out_arr changed
+        self.tk_image = None
+        self.dirty_bbox = None # (left, top, right, bottom) not yet on the photo
+        self._redraw_pending = False # Set while a canvas update is queued
+
         # --- Layout ---
         self._setup_ui()
         self._update_canvas()
         self._draw_cursor() # Initial draw
 
+        # JIT-compile the fill kernel while the user is still placing points,
+        # so the first Fill & Compare doesn't stall on it
+        threading.Thread(target=warm_up_kernels, daemon=True).start()
+
         print(f"Loaded '{main_img_path}'.")
         print("Controls:")
         print("  - Mouse Click: Add Point")
@@ -188,26 +451,66 @@ class TexturizerApp:
         self.root.geometry(f"{w}x{h}")
 
     def _update_canvas(self):
-        """Redraws the image. NOTE: This wipes the canvas items."""
-        self.tk_image = ImageTk.PhotoImage(self.out_img)
-        self.canvas.create_image(0, 0, anchor="nw", image=self.tk_image)
-        self.canvas.config(scrollregion=self.canvas.bbox("all"))
+        """Brings the canvas image up to date with out_arr (only the dirty box once it exists)."""
+        if self.tk_image is None:
+            self.tk_image = ImageTk.PhotoImage(Image.fromarray(self.out_arr))
+            self.canvas.create_image(0, 0, anchor="nw", image=self.tk_image)
+            self.canvas.config(scrollregion=self.canvas.bbox("all"))
+        elif self.dirty_bbox is not None:
+            # Upload the box as a small photo and copy it into place inside Tk
+            x0, y0, x1, y1 = self.dirty_bbox
+            patch = ImageTk.PhotoImage(Image.fromarray(self.out_arr[y0:y1, x0:x1]))
+            self.canvas.tk.call(str(self.tk_image), "copy", str(patch), "-to", x0, y0)
+        self.dirty_bbox = None
+
+        # The image now contains every edited pixel; previews are stale
+        self.canvas.delete("userpt")
+        self.canvas.delete("preview")
         
-        # After updating the image, we must redraw the cursor or it disappears behind the image
+        # Keep the cursor above the image
         self._draw_cursor()
 
+    def schedule_redraw(self):
+        """Queues a single canvas update for when Tk is idle; repeat calls are merged."""
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.root.after_idle(self._do_redraw)
+
+    def _do_redraw(self):
+        self._redraw_pending = False
+        self._update_canvas()
+
+    def _mark_dirty(self, x0, y0, x1, y1):
+        """Grows the region of out_arr that the canvas image is missing."""
+        if self.dirty_bbox is not None:
+            x0, y0 = min(x0, self.dirty_bbox[0]), min(y0, self.dirty_bbox[1])
+            x1, y1 = max(x1, self.dirty_bbox[2]), max(y1, self.dirty_bbox[3])
+        self.dirty_bbox = (x0, y0, x1, y1)
+
+    def _draw_pixel_item(self, x, y, color):
+        """Shows one edited pixel as a 1x1 canvas item, so the image needn't be rebuilt."""
+        self._mark_dirty(x, y, x + 1, y + 1)
+        self.canvas.create_rectangle(
+            x, y, x + 1, y + 1,
+            fill="#%02x%02x%02x" % color, outline="",
+            tags=("userpt", f"pt_{x}_{y}")
+        )
+
     # --- Cursor Logic ---
     
     def _draw_cursor(self):
         """Draws a vertical line where the top tip is the active point (cx, cy)."""
-        # Remove old cursor
-        for item in self.cursor_items:
-            self.canvas.delete(item)
-        self.cursor_items.clear()
-
         cx, cy = self.cursor_x, self.cursor_y
         length = CURSOR_SIZE 
-        
+
+        # Move the existing line rather than deleting and recreating it,
+        # and keep it above any pixel items added since
+        if self.cursor_items:
+            l1 = self.cursor_items[0]
+            self.canvas.coords(l1, cx, cy, cx, cy + length)
+            self.canvas.tag_raise(l1)
+            return
+
         # Draw Vertical Line starting at (cx, cy) and going down
         l1 = self.canvas.create_line(cx, cy, cx, cy + length, fill=CURSOR_COLOR, width=1)
         
@@ -220,8 +523,8 @@ class TexturizerApp:
         new_y = self.cursor_y + dy
         
         # Clamp to image bounds
-        new_x = max(0, min(self.out_img.width - 1, new_x))
-        new_y = max(0, min(self.out_img.height - 1, new_y))
+        new_x = max(0, min(self.img_orig.width - 1, new_x))
+        new_y = max(0, min(self.img_orig.height - 1, new_y))
         
         self.cursor_x = new_x
         self.cursor_y = new_y
@@ -248,33 +551,53 @@ class TexturizerApp:
 
         self._add_point_at(cx, cy)
 
+    @property
+    def drawn_points(self):
+        """The points added so far, as an (N, 2) view of pts_xy."""
+        return self.pts_xy[:self.n_pts]
+
+    def _append_point(self, x, y):
+        # Double the buffer when full, so appends stay amortized O(1)
+        if self.n_pts == len(self.pts_xy):
+            grown = np.empty((2 * len(self.pts_xy), 2), dtype=np.int32)
+            grown[:self.n_pts] = self.pts_xy
+            self.pts_xy = grown
+        self.pts_xy[self.n_pts] = (x, y)
+        self.n_pts += 1
+
     def _add_point_at(self, cx, cy):
         """Core logic to add/remove points at specific coordinates."""
-        pixels = self.out_img.load()
-        modified = False
+        # Like a repaint used to, any edit clears the line preview
+        self.canvas.delete("preview")
 
         if self.current_mode == "draw":
-            self.drawn_points.append((cx, cy))
-            if 0 <= cx < self.out_img.width and 0 <= cy < self.out_img.height:
-                pixels[cx, cy] = DRAW_COLOR
-                modified = True
+            self._append_point(cx, cy)
+            if 0 <= cx < self.img_orig.width and 0 <= cy < self.img_orig.height:
+                self.out_arr[cy, cx] = DRAW_COLOR
+                self._draw_pixel_item(cx, cy, DRAW_COLOR)
                 print(f"Point added at: {cx}, {cy}")
         
         elif self.current_mode == "erase":
             r = ERASE_RADIUS
-            to_remove = [p for p in self.drawn_points 
-                         if (cx - r <= p[0] <= cx + r) and (cy - r <= p[1] <= cy + r)]
+            # One vectorized box test over all points, then compact the survivors
+            pts = self.drawn_points
+            hit = (np.abs(pts[:, 0] - cx) <= r) & (np.abs(pts[:, 1] - cy) <= r)
+            erased = [tuple(p) for p in pts[hit].tolist()]
+            keep = pts[~hit]
+            self.n_pts = len(keep)
+            self.pts_xy[:self.n_pts] = keep
             
-            for p in to_remove:
-                self.drawn_points.remove(p)
-                orig_px = self.img_orig.getpixel(p)
-                pixels[p[0], p[1]] = orig_px
-                modified = True
+            for p in erased:
+                # Points clicked off the image were never painted
+                if not (0 <= p[0] < self.img_orig.width and 0 <= p[1] < self.img_orig.height):
+                    continue
+                orig_px = tuple(self.orig_arr[p[1], p[0]].tolist())
+                self.out_arr[p[1], p[0]] = orig_px
+                # Cover whatever the canvas shows there with the restored color
+                self.canvas.delete(f"pt_{p[0]}_{p[1]}")
+                self._draw_pixel_item(p[0], p[1], orig_px)
                 print(f"Point erased at: {p}")
 
-        if modified:
-            self._update_canvas()
-
     # --- Mode & Processing Logic ---
 
     def set_mode_draw(self):
@@ -286,47 +609,42 @@ class TexturizerApp:
         print("Mode: ERASE")
 
     def draw_lines(self):
-        if not self.drawn_points: return
-        preview_img = self.out_img.copy() 
-        draw = ImageDraw.Draw(preview_img)
-        h = preview_img.height
-        pts = self.drawn_points
+        if self.n_pts == 0: return
+        # Drawn as canvas lines on top of the image, removed on the next edit
+        self.canvas.delete("preview")
+        h = self.img_orig.height
+        pts = self.drawn_points.tolist()
+        color = "#%02x%02x%02x" % DRAW_COLOR
         
         first_ground = (pts[0][0], h - 1)
         last_ground = (pts[-1][0], h - 1)
         
-        draw.line((pts[0], first_ground), fill=DRAW_COLOR, width=1)
+        self.canvas.create_line(pts[0], first_ground, fill=color, width=1, tags="preview")
         if len(pts) > 1:
-            draw.line(pts, fill=DRAW_COLOR, width=1)
-            draw.line((pts[-1], last_ground), fill=DRAW_COLOR, width=1)
+            self.canvas.create_line(*pts, fill=color, width=1, tags="preview")
+            self.canvas.create_line(pts[-1], last_ground, fill=color, width=1, tags="preview")
         
-        self.tk_image = ImageTk.PhotoImage(preview_img)
-        self.canvas.create_image(0, 0, anchor="nw", image=self.tk_image)
         self._draw_cursor() # Keep cursor visible
 
     def process_image(self):
-        if len(self.drawn_points) < 2:
+        if self.n_pts < 2:
             print("Need at least 2 points to define a region.")
             return
 
         print("Starting processing...")
-        h = self.out_img.height
-        poly_vertices = list(self.drawn_points)
-        poly_vertices.append((self.drawn_points[-1][0], h - 1))
-        poly_vertices.append((self.drawn_points[0][0], h - 1))
-
-        manual_fill_polygon(
-            self.out_img, 
-            poly_vertices, 
-            self.tex_pixels, 
-            self.tex_width, 
-            self.tex_height
-        )
+        h = self.img_orig.height
+        pts = self.drawn_points.tolist()
+        # Drawn points, then down to the bottom row and back under the first one
+        poly_vertices = [*map(tuple, pts), (pts[-1][0], h - 1), (pts[0][0], h - 1)]
 
-        self._update_canvas()
+        bbox = manual_fill_polygon(self.out_arr, poly_vertices, self.tex_arr)
+        if bbox is not None:
+            self._mark_dirty(*bbox)
+
+        self.schedule_redraw()
         
         try:
-            self.out_img.save(OUTPUT_FILENAME)
+            Image.fromarray(self.out_arr).save(OUTPUT_FILENAME)
             print(f"Success! Image saved to: {OUTPUT_FILENAME}")
         except Exception as e:
             print(f"Error saving image: {e}")